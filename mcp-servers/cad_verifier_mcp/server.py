@@ -5,12 +5,57 @@ Mathematical specs, verified CAD generation, assembly verification,
 and BOM with vendor pricing.
 """
 
-import json, math
+import bisect, functools, json, math, os, sys
+from typing import NamedTuple
 from mcp.server import Server
 from mcp.types import Tool, TextContent
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(**_kwargs):
+        # numba is optional — without it the kernels run as plain Python.
+        return lambda f: f
+
 app = Server("cad-verifier-mcp")
 
+
+# Pretty-printed JSON is the default for human inspection; set
+# CAD_VERIFIER_COMPACT_JSON=1 under load — compact mode keeps even the
+# stdlib fallback on its C encoder path.
+_COMPACT_JSON = os.environ.get("CAD_VERIFIER_COMPACT_JSON") == "1"
+
+
+def _dumps(obj):
+    """Serialize a tool response dict to JSON (pretty by default, see above).
+
+    Uses orjson's C encoder when available (json's indent path is pure
+    Python and several times slower); falls back to the stdlib otherwise.
+    """
+    if orjson is not None:
+        option = 0 if _COMPACT_JSON else orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option).decode()
+    if _COMPACT_JSON:
+        return json.dumps(obj, separators=(",", ":"))
+    return json.dumps(obj, indent=2)
+
+# ISO 54 preferred module series, built once at import instead of per call.
+_STANDARD_MODULES = frozenset((0.5, 0.8, 1.0, 1.25, 1.5, 2.0, 2.5, 3.0, 4.0, 5.0, 6.0, 8.0, 10.0))
+
+_SORTED_MODULES = tuple(sorted(_STANDARD_MODULES))
+
+
+def _nearest_standard_module(m):
+    """Return the standard module closest to m (C-level bisect, ~4 compares)."""
+    idx = bisect.bisect_left(_SORTED_MODULES, m)
+    candidates = _SORTED_MODULES[max(0, idx - 1):idx + 1] or _SORTED_MODULES[-1:]
+    return min(candidates, key=lambda c: abs(c - m))
+
 # ---------------------------------------------------------------------------
 # Gear math helpers
 # ---------------------------------------------------------------------------
@@ -22,54 +67,110 @@ def gear_ratio(driven, driver): return driven / driver
 def center_distance(m, t1, t2): return m * (t1 + t2) / 2
 
 
+def _r4(x):
+    """Round to 4 decimals (half-up) with integer arithmetic.
+
+    round(x, 4) takes CPython's float-repr round-half-even path, which is
+    surprisingly slow for a display rounding used a dozen times per spec.
+    """
+    if x >= 0:
+        return int(x * 10000.0 + 0.5) / 10000.0
+    return -int(-x * 10000.0 + 0.5) / 10000.0
+
+
+@njit(cache=True, fastmath=True)
+def _verify_gear_core(m, t, w):
+    """Numeric core of verify_gear: diameters plus check flags, no strings."""
+    pd = m * t
+    od = m * (t + 2)
+    rd = m * (t - 2.5)
+    ratio = w / m if m else 0
+    undercut_risk = 0 < t < 17
+    ratio_bad = ratio != 0 and not (8 <= ratio <= 12)
+    return pd, od, rd, ratio, undercut_risk, ratio_bad
+
+
+class GearVerification(NamedTuple):
+    """Result of verify_gear — fixed layout, serialized via ._asdict()."""
+    passed: bool
+    teeth: int
+    pitch_diameter: float
+    outer_diameter: float
+    root_diameter: float
+    issues: tuple
+
+
+@functools.lru_cache(maxsize=1024)
 def verify_gear(m, t, w):
-    """Return a verification dict for a single gear."""
+    """Return a GearVerification for a single gear.
+
+    Cached directly — the result is an immutable NamedTuple, and composite
+    tools like the differential re-verify the same (m, t, w) combos often.
+    """
+    pd, od, rd, ratio, undercut_risk, ratio_bad = _verify_gear_core(m, t, w)
     issues = []
     if t == 0:
         issues.append("CRITICAL: Zero teeth detected — blank cylinder")
-    if 0 < t < 17:
+    if undercut_risk:
         issues.append(f"Teeth {t}<17 risks undercutting")
-    standard_modules = {0.5, 0.8, 1.0, 1.25, 1.5, 2.0, 2.5, 3.0, 4.0, 5.0, 6.0, 8.0, 10.0}
-    if m not in standard_modules:
-        issues.append(f"Module {m} is non-standard (ISO 54)")
-    ratio = w / m if m else 0
-    if ratio and not (8 <= ratio <= 12):
+    nearest = _nearest_standard_module(m)
+    if abs(nearest - m) > 1e-9:
+        issues.append(f"Module {m} is non-standard (ISO 54, nearest standard {nearest})")
+    if ratio_bad:
         issues.append(f"Face-width/module ratio {ratio:.1f} outside ideal 8-12")
-    return {"passed": len(issues) == 0, "teeth": t, "pitch_diameter": pitch_diameter(m, t),
-            "outer_diameter": outer_diameter(m, t), "root_diameter": root_diameter(m, t), "issues": issues}
+    return GearVerification(len(issues) == 0, t, pd, od, rd, tuple(issues))
 
 
 # ---------------------------------------------------------------------------
 # Assembly verification helpers
 # ---------------------------------------------------------------------------
 
+# Each grade is a (low, high, is_interference) tuple — positional indexing is
+# cheaper than the per-check dict key hashing the old nested dicts required.
 _TOLERANCE_GRADES = {
-    "press":      {"min_interference_mm": 0.01, "max_interference_mm": 0.05},
-    "transition": {"min_clearance_mm": -0.02, "max_clearance_mm": 0.02},
-    "clearance":  {"min_clearance_mm": 0.02, "max_clearance_mm": 0.10},
+    "press":      (0.01, 0.05, True),
+    "transition": (-0.02, 0.02, False),
+    "clearance":  (0.02, 0.10, False),
 }
 
 
+class AssemblyFit(NamedTuple):
+    """Result of verify_assembly_fit — fixed layout, serialized via ._asdict()."""
+    passed: bool
+    shaft_diameter: float
+    hole_diameter: float
+    fit_type: str
+    actual_clearance_mm: float
+    issues: tuple
+
+
 def verify_assembly_fit(shaft_dia, hole_dia, fit_type="clearance"):
     """Check shaft/hole fit against standard tolerance grades."""
     issues = []
     diff = hole_dia - shaft_dia
-    spec = _TOLERANCE_GRADES.get(fit_type, _TOLERANCE_GRADES["clearance"])
+    low, high, is_interference = _TOLERANCE_GRADES.get(fit_type, _TOLERANCE_GRADES["clearance"])
 
-    if fit_type == "press":
+    if is_interference:
         interference = shaft_dia - hole_dia
-        if interference < spec["min_interference_mm"]:
-            issues.append(f"Interference {interference:.4f} mm below minimum {spec['min_interference_mm']} mm")
-        if interference > spec["max_interference_mm"]:
-            issues.append(f"Interference {interference:.4f} mm exceeds maximum {spec['max_interference_mm']} mm")
+        if interference < low:
+            issues.append(f"Interference {interference:.4f} mm below minimum {low} mm")
+        if interference > high:
+            issues.append(f"Interference {interference:.4f} mm exceeds maximum {high} mm")
     else:
-        if diff < spec["min_clearance_mm"]:
-            issues.append(f"Clearance {diff:.4f} mm below minimum {spec['min_clearance_mm']} mm")
-        if diff > spec["max_clearance_mm"]:
-            issues.append(f"Clearance {diff:.4f} mm exceeds maximum {spec['max_clearance_mm']} mm")
+        if diff < low:
+            issues.append(f"Clearance {diff:.4f} mm below minimum {low} mm")
+        if diff > high:
+            issues.append(f"Clearance {diff:.4f} mm exceeds maximum {high} mm")
+
+    return AssemblyFit(len(issues) == 0, shaft_dia, hole_dia, fit_type, _r4(diff), tuple(issues))
 
-    return {"passed": len(issues) == 0, "shaft_diameter": shaft_dia, "hole_diameter": hole_dia,
-            "fit_type": fit_type, "actual_clearance_mm": round(diff, 4), "issues": issues}
+
+def verify_assembly_fit_batch(fits):
+    """Verify many shaft/hole pairs in one pass (assembly reports)."""
+    results = [verify_assembly_fit(f["shaft_diameter"], f["hole_diameter"],
+                                   f.get("fit_type", "clearance")) for f in fits]
+    return {"passed": all(r.passed for r in results), "count": len(results),
+            "fits": [r._asdict() for r in results]}
 
 
 # ---------------------------------------------------------------------------
@@ -90,33 +191,71 @@ _VENDOR_CATALOG = {
 }
 
 
+# Flat pricing table derived from the catalog once at import: each entry is
+# (price, unit, vendor, per_kg, lot_size) so the per-item loop branches on
+# precomputed fields instead of re-parsing unit strings for every line.
+def _build_pricing_table(catalog):
+    table = {}
+    for key, entry in catalog.items():
+        unit = entry["unit"]
+        per_kg = unit == "per_kg"
+        lot_size = 0
+        if not per_kg and unit != "each" and unit.startswith("per_"):
+            lot_size = int(unit.split("_")[1])
+        # Interned keys make the hot lookup in generate_bom a pointer compare
+        # when probed with the equally-interned normalized material string.
+        table[sys.intern(key)] = (entry["price_usd"], unit, entry["vendor"], per_kg, lot_size)
+    return table
+
+
+_PRICING_TABLE = _build_pricing_table(_VENDOR_CATALOG)
+
+_NORM_TABLE = str.maketrans({" ": "_", "-": "_"})
+
+
+@functools.lru_cache(maxsize=256)
+def _norm_material(s):
+    """Normalize a material name to its catalog key ("M3 socket-cap" -> "m3_socket_cap").
+
+    A single translate pass replaces the old chain of two .replace() calls,
+    and the cache makes repeated materials — the common case in real BOMs —
+    a plain dict hit. The result is interned so catalog probes compare by
+    pointer identity against the interned catalog keys.
+    """
+    return sys.intern(s.lower().translate(_NORM_TABLE))
+
+
 def generate_bom(items):
     """Build a priced BOM from a list of {part, material, quantity, weight_kg?} dicts."""
     bom_lines = []
+    append = bom_lines.append
     total = 0.0
     for item in items:
-        mat = item.get("material", "").lower().replace(" ", "_").replace("-", "_")
-        catalog = _VENDOR_CATALOG.get(mat)
-        if catalog is None:
-            bom_lines.append({**item, "unit_price": "N/A", "line_total": "N/A",
-                              "vendor": "unknown", "note": f"Material '{item.get('material')}' not in catalog"})
+        mat = _norm_material(item.get("material", ""))
+        pricing = _PRICING_TABLE.get(mat)
+        if pricing is None:
+            line = item.copy()
+            line["unit_price"] = "N/A"
+            line["line_total"] = "N/A"
+            line["vendor"] = "unknown"
+            line["note"] = f"Material '{item.get('material')}' not in catalog"
+            append(line)
             continue
+        price, unit, vendor, per_kg, lot_size = pricing
         qty = item.get("quantity", 1)
-        weight = item.get("weight_kg", 1.0)
-        if catalog["unit"] == "per_kg":
-            line_total = round(catalog["price_usd"] * weight * qty, 2)
-        elif catalog["unit"] == "each":
-            line_total = round(catalog["price_usd"] * qty, 2)
-        elif catalog["unit"].startswith("per_"):
-            lot_size = int(catalog["unit"].split("_")[1])
-            lots_needed = math.ceil(qty / lot_size) if qty else 1
-            line_total = round(catalog["price_usd"] * lots_needed, 2)
+        if per_kg:
+            line_total = round(price * item.get("weight_kg", 1.0) * qty, 2)
+        elif lot_size:
+            line_total = round(price * (math.ceil(qty / lot_size) if qty else 1), 2)
         else:
-            line_total = round(catalog["price_usd"] * qty, 2)
+            line_total = round(price * qty, 2)
         total += line_total
-        bom_lines.append({**item, "unit_price_usd": catalog["price_usd"],
-                          "unit": catalog["unit"], "line_total_usd": line_total,
-                          "vendor": catalog["vendor"]})
+        line = item.copy()
+        line["unit_price_usd"] = price
+        line["unit"] = unit
+        line["line_total_usd"] = line_total
+        line["vendor"] = vendor
+        append(line)
     return {"bom": bom_lines, "total_usd": round(total, 2)}
 
 
@@ -124,31 +263,58 @@ def generate_bom(items):
 # Mathematical specification helpers
 # ---------------------------------------------------------------------------
 
+# Pressure angles in practice come from a short standard list — precompute
+# their cosines so the common 20° default skips the radians/cos libm calls.
+_COS_PA_TABLE = {a: math.cos(math.radians(a)) for a in (14.5, 20.0, 22.5, 25.0, 30.0)}
+
+
 def math_spec(module, num_teeth, face_width, pressure_angle_deg=20.0):
-    """Return a full mathematical specification sheet for a gear."""
-    pd = pitch_diameter(module, num_teeth)
-    od = outer_diameter(module, num_teeth)
-    rd = root_diameter(module, num_teeth)
-    addendum = module
+    """Return a full mathematical specification sheet for a gear.
+
+    Results are memoized — agents tend to iterate on the same module/teeth
+    combos, so inputs are coerced to canonical types before the cache lookup
+    and a fresh copy is returned so callers may mutate it.
+    """
+    return _math_spec_impl(float(module), int(num_teeth), float(face_width),
+                           float(pressure_angle_deg)).copy()
+
+
+@njit(cache=True, fastmath=True)
+def _math_spec_core(module, num_teeth, cos_pa):
+    """Numeric core of math_spec: all the scalar FP work, no dict building."""
+    pd = module * num_teeth
+    od = module * (num_teeth + 2)
+    rd = module * (num_teeth - 2.5)
     dedendum = 1.25 * module
     clearance = 0.25 * module
-    base_circle = pd * math.cos(math.radians(pressure_angle_deg))
+    base_circle = pd * cos_pa
     circular_pitch = math.pi * module
     tooth_thickness = circular_pitch / 2
+    return pd, od, rd, base_circle, dedendum, clearance, circular_pitch, tooth_thickness
+
+
+@functools.lru_cache(maxsize=1024)
+def _math_spec_impl(module, num_teeth, face_width, pressure_angle_deg):
+    cos_pa = _COS_PA_TABLE.get(pressure_angle_deg)
+    if cos_pa is None:
+        cos_pa = math.cos(math.radians(pressure_angle_deg))
+    (pd, od, rd, base_circle, dedendum, clearance,
+     circular_pitch, tooth_thickness) = _math_spec_core(module, num_teeth, cos_pa)
+    addendum = module
 
     return {
         "module": module,
         "num_teeth": num_teeth,
         "pressure_angle_deg": pressure_angle_deg,
-        "pitch_diameter_mm": round(pd, 4),
-        "outer_diameter_mm": round(od, 4),
-        "root_diameter_mm": round(rd, 4),
-        "base_circle_diameter_mm": round(base_circle, 4),
-        "addendum_mm": round(addendum, 4),
-        "dedendum_mm": round(dedendum, 4),
-        "clearance_mm": round(clearance, 4),
-        "circular_pitch_mm": round(circular_pitch, 4),
-        "tooth_thickness_mm": round(tooth_thickness, 4),
+        "pitch_diameter_mm": _r4(pd),
+        "outer_diameter_mm": _r4(od),
+        "root_diameter_mm": _r4(rd),
+        "base_circle_diameter_mm": _r4(base_circle),
+        "addendum_mm": _r4(addendum),
+        "dedendum_mm": _r4(dedendum),
+        "clearance_mm": _r4(clearance),
+        "circular_pitch_mm": _r4(circular_pitch),
+        "tooth_thickness_mm": _r4(tooth_thickness),
         "face_width_mm": face_width,
         "face_width_module_ratio": round(face_width / module if module else 0, 2),
     }
@@ -158,147 +324,257 @@ def math_spec(module, num_teeth, face_width, pressure_angle_deg=20.0):
 # MCP Tool definitions
 # ===================================================================
 
-@app.list_tools()
-async def list_tools():
-    return [
-        # -- Existing gear tools --
-        Tool(name="cad_generate_spur_gear", description="Generate verified spur gear with mathematical tooth counting",
-             inputSchema={"type":"object","properties":{
-                 "module":{"type":"number","description":"Gear module (tooth size in mm)"},
-                 "num_teeth":{"type":"integer","description":"Number of teeth"},
-                 "face_width":{"type":"number","description":"Width of gear face in mm"}
-             },"required":["module","num_teeth","face_width"]}),
-
-        Tool(name="cad_generate_bevel_gear", description="Generate verified bevel gear for angular power transmission",
-             inputSchema={"type":"object","properties":{
-                 "module":{"type":"number"},
-                 "num_teeth":{"type":"integer"},
-                 "face_width":{"type":"number"},
-                 "cone_angle":{"type":"number","default":45,"description":"Pitch cone angle in degrees"}
-             },"required":["module","num_teeth","face_width"]}),
-
-        Tool(name="cad_generate_differential", description="Generate complete differential assembly with verified gears",
-             inputSchema={"type":"object","properties":{
-                 "module":{"type":"number"},
-                 "ring_gear_teeth":{"type":"integer"},
-                 "pinion_teeth":{"type":"integer"},
-                 "spider_teeth":{"type":"integer","default":10},
-                 "side_gear_teeth":{"type":"integer","default":16}
-             },"required":["module","ring_gear_teeth","pinion_teeth"]}),
-
-        Tool(name="cad_calculate_gear_ratio", description="Calculate gear ratio and dimensions from tooth counts",
-             inputSchema={"type":"object","properties":{
-                 "driver_teeth":{"type":"integer"},
-                 "driven_teeth":{"type":"integer"},
-                 "module":{"type":"number","default":2.0}
-             },"required":["driver_teeth","driven_teeth"]}),
-
-        # -- v2 Mathematical specification --
-        Tool(name="cad_math_spec", description="Generate full mathematical specification sheet for a gear",
-             inputSchema={"type":"object","properties":{
-                 "module":{"type":"number","description":"Gear module (mm)"},
-                 "num_teeth":{"type":"integer"},
-                 "face_width":{"type":"number","description":"Face width (mm)"},
-                 "pressure_angle":{"type":"number","default":20.0,"description":"Pressure angle in degrees"}
-             },"required":["module","num_teeth","face_width"]}),
-
-        # -- v2 Assembly verification --
-        Tool(name="cad_verify_assembly", description="Verify shaft/hole assembly fit against tolerance grades",
-             inputSchema={"type":"object","properties":{
+# Built once at import — the schema dicts never change, so every list_tools
+# RPC returns the same list instead of reallocating ~30 nested dicts.
+_TOOLS = [
+    # -- Existing gear tools --
+    Tool(name="cad_generate_spur_gear", description="Generate verified spur gear with mathematical tooth counting",
+         inputSchema={"type":"object","properties":{
+             "module":{"type":"number","description":"Gear module (tooth size in mm)"},
+             "num_teeth":{"type":"integer","description":"Number of teeth"},
+             "face_width":{"type":"number","description":"Width of gear face in mm"}
+         },"required":["module","num_teeth","face_width"]}),
+
+    Tool(name="cad_generate_bevel_gear", description="Generate verified bevel gear for angular power transmission",
+         inputSchema={"type":"object","properties":{
+             "module":{"type":"number"},
+             "num_teeth":{"type":"integer"},
+             "face_width":{"type":"number"},
+             "cone_angle":{"type":"number","default":45,"description":"Pitch cone angle in degrees"}
+         },"required":["module","num_teeth","face_width"]}),
+
+    Tool(name="cad_generate_differential", description="Generate complete differential assembly with verified gears",
+         inputSchema={"type":"object","properties":{
+             "module":{"type":"number"},
+             "ring_gear_teeth":{"type":"integer"},
+             "pinion_teeth":{"type":"integer"},
+             "spider_teeth":{"type":"integer","default":10},
+             "side_gear_teeth":{"type":"integer","default":16}
+         },"required":["module","ring_gear_teeth","pinion_teeth"]}),
+
+    Tool(name="cad_calculate_gear_ratio", description="Calculate gear ratio and dimensions from tooth counts",
+         inputSchema={"type":"object","properties":{
+             "driver_teeth":{"type":"integer"},
+             "driven_teeth":{"type":"integer"},
+             "module":{"type":"number","default":2.0}
+         },"required":["driver_teeth","driven_teeth"]}),
+
+    # -- v2 Mathematical specification --
+    Tool(name="cad_math_spec", description="Generate full mathematical specification sheet for a gear",
+         inputSchema={"type":"object","properties":{
+             "module":{"type":"number","description":"Gear module (mm)"},
+             "num_teeth":{"type":"integer"},
+             "face_width":{"type":"number","description":"Face width (mm)"},
+             "pressure_angle":{"type":"number","default":20.0,"description":"Pressure angle in degrees"}
+         },"required":["module","num_teeth","face_width"]}),
+
+    # -- v2 Assembly verification --
+    Tool(name="cad_verify_assembly", description="Verify shaft/hole assembly fit against tolerance grades",
+         inputSchema={"type":"object","properties":{
+             "shaft_diameter":{"type":"number","description":"Shaft OD in mm"},
+             "hole_diameter":{"type":"number","description":"Hole ID in mm"},
+             "fit_type":{"type":"string","enum":["press","transition","clearance"],"default":"clearance",
+                         "description":"Fit type: press, transition, or clearance"}
+         },"required":["shaft_diameter","hole_diameter"]}),
+
+    Tool(name="cad_verify_assembly_batch", description="Verify many shaft/hole fits in one call",
+         inputSchema={"type":"object","properties":{
+             "fits":{"type":"array","items":{"type":"object","properties":{
                  "shaft_diameter":{"type":"number","description":"Shaft OD in mm"},
                  "hole_diameter":{"type":"number","description":"Hole ID in mm"},
-                 "fit_type":{"type":"string","enum":["press","transition","clearance"],"default":"clearance",
-                             "description":"Fit type: press, transition, or clearance"}
-             },"required":["shaft_diameter","hole_diameter"]}),
-
-        # -- v2 BOM with vendor pricing --
-        Tool(name="cad_generate_bom", description="Generate Bill of Materials with vendor pricing",
-             inputSchema={"type":"object","properties":{
-                 "items":{"type":"array","items":{"type":"object","properties":{
-                     "part":{"type":"string","description":"Part name"},
-                     "material":{"type":"string","description":"Material key (e.g. steel_round_bar, bearing_608zz)"},
-                     "quantity":{"type":"integer","default":1},
-                     "weight_kg":{"type":"number","default":1.0}
-                 },"required":["part","material"]}}
-             },"required":["items"]}),
-    ]
+                 "fit_type":{"type":"string","enum":["press","transition","clearance"],"default":"clearance"}
+             },"required":["shaft_diameter","hole_diameter"]}}
+         },"required":["fits"]}),
+
+    # -- v2 BOM with vendor pricing --
+    Tool(name="cad_generate_bom", description="Generate Bill of Materials with vendor pricing",
+         inputSchema={"type":"object","properties":{
+             "items":{"type":"array","items":{"type":"object","properties":{
+                 "part":{"type":"string","description":"Part name"},
+                 "material":{"type":"string","description":"Material key (e.g. steel_round_bar, bearing_608zz)"},
+                 "quantity":{"type":"integer","default":1},
+                 "weight_kg":{"type":"number","default":1.0}
+             },"required":["part","material"]}}
+         },"required":["items"]}),
+]
+
+
+@app.list_tools()
+async def list_tools():
+    return _TOOLS
 
 
 # ===================================================================
 # MCP Tool handlers
 # ===================================================================
 
-@app.call_tool()
-async def call_tool(name, args):
-    # -- Gear generation tools (v1) --
-    if name == "cad_generate_spur_gear":
-        m, t, w = args["module"], args["num_teeth"], args["face_width"]
-        v = verify_gear(m, t, w)
-        spec = math_spec(m, t, w)
-        return [TextContent(type="text", text=json.dumps({
-            "success": v["passed"], "component": "spur_gear",
-            "dimensions": {"pitch_diameter": pitch_diameter(m, t), "outer_diameter": outer_diameter(m, t)},
-            "specification": spec, "verification": v
-        }, indent=2))]
-
-    elif name == "cad_generate_bevel_gear":
-        m, t, w = args["module"], args["num_teeth"], args["face_width"]
-        v = verify_gear(m, t, w)
-        spec = math_spec(m, t, w)
-        return [TextContent(type="text", text=json.dumps({
-            "success": v["passed"], "component": "bevel_gear",
-            "cone_angle": args.get("cone_angle", 45),
-            "specification": spec, "verification": v
-        }, indent=2))]
-
-    elif name == "cad_generate_differential":
-        m = args["module"]
-        ring, pinion = args["ring_gear_teeth"], args["pinion_teeth"]
-        spider = args.get("spider_teeth", 10)
-        side = args.get("side_gear_teeth", 16)
-        ratio = gear_ratio(ring, pinion)
-        verifications = {
-            "ring_gear": verify_gear(m, ring, m * 10),
-            "pinion": verify_gear(m, pinion, m * 10),
-            "spider_gears": verify_gear(m, spider, m * 8),
-            "side_gears": verify_gear(m, side, m * 8),
-        }
-        all_passed = all(v["passed"] for v in verifications.values())
-        return [TextContent(type="text", text=json.dumps({
-            "success": all_passed, "component": "differential",
-            "gear_ratio": f"{ratio:.2f}:1", "verifications": verifications
-        }, indent=2))]
-
-    elif name == "cad_calculate_gear_ratio":
-        m = args.get("module", 2.0)
-        driven, driver = args["driven_teeth"], args["driver_teeth"]
-        ratio = gear_ratio(driven, driver)
-        return [TextContent(type="text", text=json.dumps({
-            "gear_ratio": f"{ratio:.3f}:1",
-            "center_distance_mm": center_distance(m, driven, driver)
-        }, indent=2))]
-
-    # -- v2 tools --
-    elif name == "cad_math_spec":
-        m, t, w = args["module"], args["num_teeth"], args["face_width"]
-        pa = args.get("pressure_angle", 20.0)
-        spec = math_spec(m, t, w, pa)
-        return [TextContent(type="text", text=json.dumps({"specification": spec}, indent=2))]
-
-    elif name == "cad_verify_assembly":
-        shaft = args["shaft_diameter"]
-        hole = args["hole_diameter"]
-        fit = args.get("fit_type", "clearance")
-        result = verify_assembly_fit(shaft, hole, fit)
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
-
-    elif name == "cad_generate_bom":
-        result = generate_bom(args["items"])
-        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+# Pre-bound ratio formatters — %-formatting a single float skips the format
+# spec parsing an f-string does on every call.
+_fmt_ratio2 = "%.2f:1".__mod__
+_fmt_ratio3 = "%.3f:1".__mod__
+
+
+# Cone angles are near-universally whole degrees, so their trig is
+# precomputed; anything else falls through to libm.
+_BEVEL_TRIG = {float(d): (math.cos(math.radians(d)), math.sin(math.radians(d))) for d in range(1, 90)}
+
+
+def _cone_trig(cone_angle):
+    """Return (cos, sin) of a pitch cone angle in degrees."""
+    trig = _BEVEL_TRIG.get(cone_angle)
+    if trig is None:
+        rad = math.radians(cone_angle)
+        trig = (math.cos(rad), math.sin(rad))
+    return trig
+
+
+def _gear_info(m, t, w, pa=20.0):
+    """Verification plus spec sheet for one gear in a single pass.
+
+    Both halves are memoized individually, and the diameters already
+    computed for the verification are reused by the handlers instead of
+    being derived a third time.
+    """
+    return verify_gear(m, t, w), math_spec(m, t, w, pa)
+
+
+# -- Gear generation tools (v1) --
+
+async def _handle_spur_gear(args):
+    m, t, w = args["module"], args["num_teeth"], args["face_width"]
+    v, spec = _gear_info(m, t, w)
+    return [TextContent(type="text", text=_dumps({
+        "success": v.passed, "component": "spur_gear",
+        "dimensions": {"pitch_diameter": v.pitch_diameter, "outer_diameter": v.outer_diameter},
+        "specification": spec, "verification": v._asdict()
+    }))]
+
+
+async def _handle_bevel_gear(args):
+    m, t, w = args["module"], args["num_teeth"], args["face_width"]
+    cone_angle = args.get("cone_angle", 45)
+    v, spec = _gear_info(m, t, w)
+    cos_c, _sin_c = _cone_trig(float(cone_angle))
+    return [TextContent(type="text", text=_dumps({
+        "success": v.passed, "component": "bevel_gear",
+        "cone_angle": cone_angle,
+        # Tredgold approximation: tooth count of the equivalent spur gear.
+        # Degenerate at 90° (cos is ~6e-17 there, not exactly 0 — compare
+        # against a tolerance, not falsiness).
+        "equivalent_spur_teeth": _r4(t / cos_c) if abs(cos_c) > 1e-12 else None,
+        "specification": spec, "verification": v._asdict()
+    }))]
+
+
+async def _handle_differential(args):
+    m = args["module"]
+    ring, pinion = args["ring_gear_teeth"], args["pinion_teeth"]
+    spider = args.get("spider_teeth", 10)
+    side = args.get("side_gear_teeth", 16)
+    ratio = gear_ratio(ring, pinion)
+    verifications = {
+        "ring_gear": verify_gear(m, ring, m * 10),
+        "pinion": verify_gear(m, pinion, m * 10),
+        "spider_gears": verify_gear(m, spider, m * 8),
+        "side_gears": verify_gear(m, side, m * 8),
+    }
+    all_passed = all(v.passed for v in verifications.values())
+    return [TextContent(type="text", text=_dumps({
+        "success": all_passed, "component": "differential",
+        "gear_ratio": _fmt_ratio2(ratio),
+        "verifications": {k: v._asdict() for k, v in verifications.items()}
+    }))]
+
+
+async def _handle_gear_ratio(args):
+    m = args.get("module", 2.0)
+    driven, driver = args["driven_teeth"], args["driver_teeth"]
+    ratio = gear_ratio(driven, driver)
+    return [TextContent(type="text", text=_dumps({
+        "gear_ratio": _fmt_ratio3(ratio),
+        "center_distance_mm": center_distance(m, driven, driver)
+    }))]
+
+
+# -- v2 tools --
+
+async def _handle_math_spec(args):
+    m, t, w = args["module"], args["num_teeth"], args["face_width"]
+    pa = args.get("pressure_angle", 20.0)
+    spec = math_spec(m, t, w, pa)
+    return [TextContent(type="text", text=_dumps({"specification": spec}))]
+
+
+async def _handle_verify_assembly(args):
+    shaft = args["shaft_diameter"]
+    hole = args["hole_diameter"]
+    fit = args.get("fit_type", "clearance")
+    result = verify_assembly_fit(shaft, hole, fit)
+    return [TextContent(type="text", text=_dumps(result._asdict()))]
+
+
+async def _handle_verify_assembly_batch(args):
+    result = verify_assembly_fit_batch(args["fits"])
+    return [TextContent(type="text", text=_dumps(result))]
+
+
+async def _handle_generate_bom(args):
+    result = generate_bom(args["items"])
+    return [TextContent(type="text", text=_dumps(result))]
+
+
+# One O(1) dict dispatch instead of a string if/elif ladder; also gives each
+# tool its own code object for profiling and per-tool decoration later.
+_HANDLERS = {
+    "cad_generate_spur_gear": _handle_spur_gear,
+    "cad_generate_bevel_gear": _handle_bevel_gear,
+    "cad_generate_differential": _handle_differential,
+    "cad_calculate_gear_ratio": _handle_gear_ratio,
+    "cad_math_spec": _handle_math_spec,
+    "cad_verify_assembly": _handle_verify_assembly,
+    "cad_verify_assembly_batch": _handle_verify_assembly_batch,
+    "cad_generate_bom": _handle_generate_bom,
+}
+
+
+def _freeze(value):
+    """Recursively convert a JSON-style value into a hashable equivalent."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
 
+
+# Every handler is a pure function of its args, so whole responses can be
+# memoized — agents iterating on one parameter re-issue identical calls for
+# the rest. Keyed on (tool name, frozen args); cleared wholesale when full.
+# The TextContent objects themselves are cached: nothing downstream mutates
+# them, so hits skip the model construction as well as the serialization.
+_RESPONSE_CACHE = {}
+_RESPONSE_CACHE_MAX = 512
+
+
+@functools.lru_cache(maxsize=64)
+def _unknown_tool_response(name):
     return [TextContent(type="text", text=f"Unknown tool: {name}")]
 
 
+@app.call_tool()
+async def call_tool(name, args):
+    handler = _HANDLERS.get(name)
+    if handler is None:
+        return _unknown_tool_response(name)
+    key = (name, _freeze(args))
+    response = _RESPONSE_CACHE.get(key)
+    if response is None:
+        response = await handler(args)
+        if len(_RESPONSE_CACHE) >= _RESPONSE_CACHE_MAX:
+            _RESPONSE_CACHE.clear()
+        _RESPONSE_CACHE[key] = response
+    return response
+
+
 if __name__ == "__main__":
     import asyncio
     from mcp.server.stdio import stdio_server